@@ -3,6 +3,10 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from bisect import bisect_left
+import os
+import re
+import unicodedata
 import numpy as np
 
 # Configuração da página
@@ -114,6 +118,80 @@ def load_data(uploaded_file=None):
         return None
 
 
+SEARCH_COLUMNS = ['Título', 'Requerente - Requerente']
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def normalize_text(text):
+    """Remove acentos e converte para minúsculas (ex.: 'Usuário' -> 'usuario')"""
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+def tokenize(text):
+    """Separa o texto em tokens normalizados, tratando <br> como separador"""
+    # Requerentes múltiplos vêm separados por <br>, como os técnicos
+    tokens = set()
+    for part in str(text).split('<br>'):
+        tokens.update(TOKEN_PATTERN.findall(normalize_text(part)))
+    return tokens
+
+def get_dataset_key(uploaded_file=None):
+    """Identifica o dataset carregado sem percorrer os dados"""
+    if uploaded_file is not None:
+        return f"upload:{uploaded_file.file_id}"
+    try:
+        return f"glpi.csv:{os.path.getmtime('glpi.csv')}"
+    except OSError:
+        return "glpi.csv"
+
+@st.cache_resource(max_entries=4)
+def build_search_index(_df, dataset_key):
+    """Cria índice invertido (token -> linhas) sobre Título e Requerente"""
+    # O DataFrame (_df) não é hasheado: o cache usa apenas dataset_key, então
+    # cada rerun custa só a consulta. cache_resource evita copiar o índice.
+    df = _df
+    postings = {}
+    tokens_cache = {}
+    for col in SEARCH_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col].fillna('').astype(str).to_numpy()
+        for pos, value in enumerate(values):
+            # Títulos e requerentes se repetem muito; tokeniza cada valor uma vez
+            tokens = tokens_cache.get(value)
+            if tokens is None:
+                tokens = tokens_cache[value] = tokenize(value)
+            for token in tokens:
+                postings.setdefault(token, []).append(pos)
+    
+    # Vocabulário ordenado permite busca por prefixo com bisect
+    vocab = sorted(postings)
+    return {
+        'vocab': vocab,
+        'postings': [np.unique(np.array(postings[t], dtype=np.int64)) for t in vocab],
+        'labels': df.index.to_numpy()
+    }
+
+def search_tickets(index, query):
+    """Retorna os índices das linhas que contêm todos os termos da busca (por prefixo)"""
+    tokens = TOKEN_PATTERN.findall(normalize_text(query))
+    if not tokens:
+        return None
+    
+    vocab = index['vocab']
+    result = None
+    for token in tokens:
+        # Todos os termos do vocabulário que começam com o token digitado
+        start = bisect_left(vocab, token)
+        end = bisect_left(vocab, token + '\uffff')
+        if start == end:
+            return index['labels'][:0]
+        matches = index['postings'][start:end]
+        matches = matches[0] if len(matches) == 1 else np.unique(np.concatenate(matches))
+        result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+        if len(result) == 0:
+            break
+    
+    return index['labels'][result]
 
 def create_monthly_timeline_chart(df, estado_filter=None):
     """Cria gráfico de evolução mensal dos tickets"""
@@ -412,6 +490,7 @@ def main():
         
         if st.button("🔄 Atualizar Dashboard"):
             st.cache_data.clear()
+            st.cache_resource.clear()
             st.rerun()
         
         st.markdown("---")
@@ -626,6 +705,13 @@ def main():
     # Tabela de dados filtráveis
     st.header("📋 Dados Detalhados")
     
+    # Busca textual
+    search_query = st.text_input(
+        "🔎 Buscar por Título ou Requerente",
+        placeholder="Ex.: criar usuario",
+        help="Busca sem distinção de acentos e maiúsculas; todos os termos devem estar presentes (aceita início de palavras)"
+    )
+    
     # Filtros
     col1, col2, col3 = st.columns(3)
     
@@ -660,6 +746,12 @@ def main():
         (df_table['Plug-ins - Departamento - Departamento'].isin(dept_filter))
     ]
     
+    # Aplica busca textual usando o índice do dataset
+    search_index = build_search_index(df, get_dataset_key(uploaded_file))
+    search_matches = search_tickets(search_index, search_query)
+    if search_matches is not None:
+        filtered_df = filtered_df[filtered_df.index.isin(search_matches)]
+    
     # Exibe tabela filtrada
     st.dataframe(filtered_df, width='stretch')
     
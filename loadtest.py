@@ -0,0 +1,568 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta
+
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DASHBOARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard.py')
+
+# Colunas no mesmo formato exportado pelo GLPI (ver glpi.csv)
+CSV_COLUMNS = [
+    'ID', 'Título', 'Entidade', 'Localização', 'Status', 'Data de abertura',
+    'Última atualização', 'Requerente - Requerente', 'Atribuído - Técnico', 'Categoria',
+    'Tempo para atendimento + Progresso', 'Tempo para solução + Progresso',
+    'Tempo para resolver excedido', 'Plug-ins - Departamento - Departamento', 'Prioridade',
+]
+
+# Valores de exemplo para geração dos dados sintéticos
+TITULOS = [
+    'Criar usuário no PC', 'Criar e-mail', 'reset de senha', 'Bloqueio do IMEI',
+    'CRIACAO E ATUALIZACAO DE USUARIOS NO GPM', 'Liberação de acesso aos módulos',
+    'Solicitação de equipamento', 'Impressora não imprime', 'Ramal sem sinal', 'Acesso à pasta da rede',
+]
+ENTIDADES = ['Ticket > TI > Cng PE', 'Ticket > TI > Cng PE > Cng RN']
+LOCALIZACOES = ['PE Recife', 'PE Caruaru', 'PE Serra Talhada', 'PE Petrolina', 'RN Parnamirim', 'RN Mossoró']
+STATUS = ['Fechado', 'Solucionado', 'Pendente', 'Em atendimento (atribuído)']
+REQUERENTES = ['Luana Martinha', 'Anderson Florencio', 'Diego Felipe', 'eduardosuame', 'Maria Clara', 'José Antônio']
+TECNICOS = [
+    'Jéssica Bernardo', 'Thiago Augusto Silva Martins', 'Anthony Valdemar Lopes da Silva', 'Fagner Brito',
+    'Jéssica Bernardo<br>Fagner Brito',
+]
+CATEGORIAS = [
+    'TI - Sistemas > GPM', 'TI - Sistemas > GPM > Liberação de acesso aos módulos',
+    'TI - Infra > Equipamentos e Hardware > Solicitação de Equipamento Extra',
+    'TI - Infra > Acesso e Contas > Permissão de Acesso a Pastas/Serviços',
+    'TI - Infra > Telefonia > Linha Móvel', 'TI - Sistemas > Sistema Corporativo > Criar Usuario',
+]
+DEPARTAMENTOS = ['Leitura', 'Gente e Gestão', 'SESMT / QSMS', 'Eletrificação', 'Financeiro', 'Frota']
+PRIORIDADES = ['Média', 'Alta']
+
+
+def generate_synthetic_csv(n_rows, seed=0, months=12):
+    """Gera um CSV sintético no formato do GLPI com o número de linhas informado"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    span_minutes = months * 30 * 24 * 60
+    fmt = '%d-%m-%Y %H:%M'
+
+    def quote(values):
+        return ';'.join(f'"{v}"' for v in values) + ';'
+
+    lines = [quote(CSV_COLUMNS)]
+    for i in range(n_rows):
+        opened = start + timedelta(minutes=rng.randrange(span_minutes))
+        updated = opened + timedelta(hours=rng.randint(1, 240))
+        ticket_id = f'{1000 + i:,}'.replace(',', ' ')
+        lines.append(quote([
+            ticket_id,
+            rng.choice(TITULOS),
+            rng.choice(ENTIDADES),
+            rng.choice(LOCALIZACOES),
+            rng.choice(STATUS),
+            opened.strftime(fmt),
+            updated.strftime(fmt),
+            rng.choice(REQUERENTES) + ' ',
+            rng.choice(TECNICOS) + ' ',
+            rng.choice(CATEGORIAS),
+            (opened + timedelta(days=3)).strftime(fmt),
+            (opened + timedelta(days=5)).strftime(fmt),
+            'Sim' if rng.random() < 0.2 else 'Não',
+            rng.choice(DEPARTAMENTOS),
+            rng.choice(PRIORIDADES),
+        ]))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def find_free_port():
+    """Porta TCP livre para o servidor de teste"""
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def start_server(data_dir, port, timeout):
+    """Inicia `streamlit run dashboard.py` em um subprocesso e espera ficar pronto"""
+    with open(os.path.join(data_dir, 'streamlit.log'), 'wb') as log:
+        process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'streamlit', 'run', DASHBOARD_PATH,
+                '--server.headless', 'true',
+                '--server.port', str(port),
+                '--server.fileWatcherType', 'none',
+                # O cliente de teste não tem cookie de XSRF para o upload de arquivos
+                '--server.enableXsrfProtection', 'false',
+                '--browser.gatherUsageStats', 'false',
+            ],
+            # O dashboard lê glpi.csv do diretório atual
+            cwd=data_dir,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as resp:
+                if resp.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    stop_server(process)
+    with open(os.path.join(data_dir, 'streamlit.log'), encoding='utf-8', errors='replace') as f:
+        raise RuntimeError(f'O servidor Streamlit não iniciou:\n{f.read()[-2000:]}')
+
+
+def stop_server(process):
+    """Encerra o servidor Streamlit"""
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def read_server_memory_mb(pid):
+    """RSS atual e pico do processo do servidor, em MB (None se indisponível)"""
+    # Linux: /proc informa também o pico (VmHWM), em kB
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {
+            'rss_mb': int(fields['VmRSS'].split()[0]) / 1024,
+            'peak_rss_mb': int(fields['VmHWM'].split()[0]) / 1024,
+        }
+    except (OSError, KeyError, ValueError):
+        pass
+
+    # Windows/macOS: psutil opcional; sem pico nativo (exceto peak_wset no Windows),
+    # o pico reportado é o maior RSS amostrado durante o teste
+    if psutil is None:
+        return None
+    try:
+        info = psutil.Process(pid).memory_info()
+    except psutil.Error:
+        return None
+    return {
+        'rss_mb': info.rss / (1024 * 1024),
+        'peak_rss_mb': getattr(info, 'peak_wset', info.rss) / (1024 * 1024),
+    }
+
+
+class DashboardClient:
+    """Cliente headless que fala o protocolo do navegador com o servidor Streamlit"""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.session_id = None
+        self.widgets = {}
+        self.widget_states = {}
+        self.headings = []
+        self.has_dataframe = False
+        self.has_exception = False
+
+    async def connect(self):
+        self.ws = await websockets.connect(
+            f'ws://{self.url}/_stcore/stream', subprotocols=['streamlit'], max_size=None
+        )
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _receive(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+        return msg
+
+    def _handle_element(self, element):
+        kind = element.WhichOneof('type')
+        if kind == 'heading':
+            self.headings.append(element.heading.body)
+        elif kind == 'dataframe':
+            self.has_dataframe = True
+        elif kind == 'exception':
+            self.has_exception = True
+        elif kind in ('multiselect', 'text_input', 'file_uploader'):
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = (kind, widget)
+
+    async def rerun(self):
+        """Envia um rerun com o estado atual dos widgets; retorna True se o script terminou bem"""
+        self.widgets = {}
+        self.headings = []
+        self.has_dataframe = False
+        self.has_exception = False
+
+        back_msg = BackMsg()
+        back_msg.rerun_script.SetInParent()
+        back_msg.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        await self.ws.send(back_msg.SerializeToString())
+
+        while True:
+            msg = await self._receive()
+            kind = msg.WhichOneof('type')
+            if kind == 'new_session':
+                self.session_id = msg.new_session.initialize.session_id
+            elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                self._handle_element(msg.delta.new_element)
+            elif kind == 'script_finished':
+                status = msg.script_finished
+                break
+
+        # Como o navegador, descarta estados de widgets que não foram redesenhados
+        active_ids = {widget.id for _, widget in self.widgets.values()}
+        self.widget_states = {wid: s for wid, s in self.widget_states.items() if wid in active_ids}
+
+        # O rerun só conta se a última seção do dashboard foi desenhada
+        return (
+            status == ForwardMsg.FINISHED_SUCCESSFULLY
+            and not self.has_exception
+            and '📋 Dados Detalhados' in self.headings
+            and self.has_dataframe
+        )
+
+    def _state_for(self, widget):
+        state = self.widget_states.get(widget.id)
+        if state is None:
+            state = self.widget_states[widget.id] = WidgetState(id=widget.id)
+        return state
+
+    def set_multiselect(self, label, values):
+        kind, widget = self.widgets.get(label, (None, None))
+        if kind != 'multiselect':
+            return False
+        state = self._state_for(widget)
+        state.string_array_value.data[:] = values
+        return True
+
+    def options_for(self, label):
+        kind, widget = self.widgets.get(label, (None, None))
+        return list(widget.options) if kind == 'multiselect' else []
+
+    def set_text(self, label, value):
+        kind, widget = self.widgets.get(label, (None, None))
+        if kind != 'text_input':
+            return False
+        self._state_for(widget).string_value = value
+        return True
+
+    async def upload(self, label, filename, content):
+        """Envia um arquivo como o navegador: pede a URL, faz o PUT e atualiza o widget"""
+        kind, widget = self.widgets.get(label, (None, None))
+        if kind != 'file_uploader' or self.session_id is None:
+            return False
+
+        request_id = str(uuid.uuid4())
+        back_msg = BackMsg()
+        back_msg.file_urls_request.request_id = request_id
+        back_msg.file_urls_request.file_names.append(filename)
+        back_msg.file_urls_request.session_id = self.session_id
+        await self.ws.send(back_msg.SerializeToString())
+
+        while True:
+            msg = await self._receive()
+            if msg.WhichOneof('type') == 'file_urls_response' and msg.file_urls_response.response_id == request_id:
+                file_urls = msg.file_urls_response.file_urls[0]
+                break
+
+        response = await asyncio.to_thread(
+            requests.put,
+            f'http://{self.url}{file_urls.upload_url}',
+            files={'UploadedFile': (filename, content, 'text/csv')},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+        info = self._state_for(widget).file_uploader_state_value.uploaded_file_info
+        del info[:]
+        uploaded = info.add()
+        uploaded.name = filename
+        uploaded.size = len(content)
+        uploaded.file_id = file_urls.file_id
+        uploaded.file_urls.CopyFrom(file_urls)
+        return True
+
+
+ACTIONS = ['estado', 'mes', 'status', 'prioridade', 'departamento', 'busca', 'upload']
+# Pesos aproximados de uso: filtros da barra lateral são os mais frequentes
+ACTION_WEIGHTS = [3, 3, 2, 2, 2, 2, 1]
+
+MULTISELECT_LABELS = {
+    'estado': 'Filtrar por Estado',
+    'mes': 'Filtrar por Mês/Ano',
+    'status': 'Filtrar por Status',
+    'prioridade': 'Filtrar por Prioridade',
+    'departamento': 'Filtrar por Departamento',
+}
+
+
+def random_subset(rng, options):
+    """Sorteia um subconjunto não vazio das opções"""
+    options = list(options)
+    if not options:
+        return []
+    return rng.sample(options, rng.randint(1, len(options)))
+
+
+async def apply_interaction(client, action, rng, upload_content):
+    """Aplica uma interação do usuário no cliente; retorna False se o widget não existir"""
+    if action == 'upload':
+        return await client.upload('Escolha um arquivo CSV', 'glpi_upload.csv', upload_content)
+
+    if action == 'busca':
+        # Digita um ou dois termos de um título/requerente existente (às vezes só o início da palavra)
+        words = rng.choice(TITULOS + REQUERENTES).split()
+        query = ' '.join(rng.sample(words, min(len(words), rng.randint(1, 2))))
+        query = query[:rng.randint(3, len(query))] if len(query) > 3 else query
+        return client.set_text('🔎 Buscar por Título ou Requerente', query)
+
+    label = MULTISELECT_LABELS[action]
+    return client.set_multiselect(label, random_subset(rng, client.options_for(label)))
+
+
+async def run_session(client, session_id, args, upload_content, start):
+    """Simula uma sessão: carga inicial seguida de interações aleatórias"""
+    rng = random.Random(args.seed * 1000 + session_id)
+    samples = []
+    errors = 0
+
+    # Todas as sessões começam juntas, depois que todos os clientes conectaram
+    await start.wait()
+    session_started = time.perf_counter()
+    actions = ['inicial'] + rng.choices(ACTIONS, weights=ACTION_WEIGHTS, k=args.interactions)
+    for action in actions:
+        try:
+            if action != 'inicial' and not await apply_interaction(client, action, rng, upload_content):
+                continue
+            started = time.perf_counter()
+            ok = await client.rerun()
+        except Exception:
+            errors += 1
+            continue
+        finished = time.perf_counter()
+        if not ok:
+            # Reruns com falha não entram nas latências
+            errors += 1
+            continue
+        samples.append((action, started, finished))
+    return {
+        'samples': samples,
+        'errors': errors,
+        'started_at': session_started,
+        'finished_at': time.perf_counter(),
+    }
+
+
+async def drive_sessions(args, url, upload_content):
+    """Conecta N clientes ao servidor e executa as sessões em paralelo"""
+    clients = [DashboardClient(url, args.timeout) for _ in range(args.sessions)]
+    await asyncio.gather(*(c.connect() for c in clients))
+    start = asyncio.Event()
+    try:
+        tasks = asyncio.gather(*(
+            run_session(client, sid, args, upload_content, start) for sid, client in enumerate(clients)
+        ))
+        start.set()
+        return await tasks
+    finally:
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+
+
+async def sample_memory(pid, stop, samples):
+    """Amostra o RSS do servidor durante o teste"""
+    while not stop.is_set():
+        memory = read_server_memory_mb(pid)
+        if memory is not None:
+            samples.append(memory['rss_mb'])
+        try:
+            await asyncio.wait_for(stop.wait(), 0.2)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_sessions_with_memory(args, url, upload_content, pid):
+    stop = asyncio.Event()
+    rss_samples = []
+    sampler = asyncio.create_task(sample_memory(pid, stop, rss_samples))
+    try:
+        results = await drive_sessions(args, url, upload_content)
+    finally:
+        stop.set()
+        await sampler
+    return results, rss_samples
+
+
+def percentile(values, pct):
+    """Percentil por interpolação linear"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * pct / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize(latencies):
+    """Resumo de latências em milissegundos"""
+    return {
+        'count': len(latencies),
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def concurrent_throughput(sessions):
+    """Throughput (reruns/s) na janela em que todas as sessões estavam ativas"""
+    window_start = max(s['started_at'] for s in sessions)
+    window_end = min(s['finished_at'] for s in sessions)
+    if window_end <= window_start:
+        return 0.0, 0.0
+    # Conta os reruns concluídos dentro da janela
+    completed = sum(
+        1 for s in sessions for _, _, finished in s['samples'] if window_start <= finished <= window_end
+    )
+    return window_end - window_start, completed / (window_end - window_start)
+
+
+def run_load_test(args):
+    """Executa o teste de carga e retorna o relatório consolidado"""
+    with tempfile.TemporaryDirectory(prefix='dashboard-loadtest-') as data_dir:
+        with open(os.path.join(data_dir, 'glpi.csv'), 'wb') as f:
+            f.write(generate_synthetic_csv(args.rows, seed=args.seed, months=args.months))
+        upload_content = generate_synthetic_csv(args.rows, seed=args.seed + 1, months=args.months)
+
+        port = args.port or find_free_port()
+        server = start_server(data_dir, port, args.timeout)
+        try:
+            memory_before = read_server_memory_mb(server.pid)
+            sessions, rss_samples = asyncio.run(
+                run_sessions_with_memory(args, f'localhost:{port}', upload_content, server.pid)
+            )
+            memory_after = read_server_memory_mb(server.pid)
+        finally:
+            stop_server(server)
+
+    samples = [sample for s in sessions for sample in s['samples']]
+    latencies = [finished - started for _, started, finished in samples]
+    by_action = {}
+    for action, started, finished in samples:
+        by_action.setdefault(action, []).append(finished - started)
+
+    # Tempo total do início comum das sessões até a última terminar (sem subir o servidor)
+    wall = max(s['finished_at'] for s in sessions) - min(s['started_at'] for s in sessions)
+    window, throughput = concurrent_throughput(sessions)
+
+    memory = None
+    if memory_after is not None:
+        memory = {
+            'pid': server.pid,
+            'rss_before_mb': memory_before['rss_mb'],
+            'rss_after_mb': memory_after['rss_mb'],
+            'peak_rss_mb': max([memory_after['peak_rss_mb']] + rss_samples),
+        }
+
+    return {
+        'config': {
+            'sessions': args.sessions,
+            'interactions': args.interactions,
+            'rows': args.rows,
+            'months': args.months,
+            'seed': args.seed,
+        },
+        'wall_time_s': wall,
+        'concurrent_window_s': window,
+        'reruns': len(latencies),
+        'errors': sum(s['errors'] for s in sessions),
+        'throughput_rps': throughput,
+        'latency': summarize(latencies),
+        'latency_by_action': {a: summarize(v) for a, v in sorted(by_action.items())},
+        'server_memory': memory,
+    }
+
+
+def print_report(report):
+    """Imprime o relatório em formato legível"""
+    cfg = report['config']
+    print(f"🎫 Teste de carga - {cfg['sessions']} sessões x {cfg['interactions']} interações, "
+          f"{cfg['rows']} linhas (um servidor streamlit run)")
+    print(f"⏱️  Tempo total: {report['wall_time_s']:.2f}s | Reruns: {report['reruns']} | Erros: {report['errors']}")
+    print(f"🚀 Throughput: {report['throughput_rps']:.2f} reruns/s "
+          f"(janela com todas as sessões ativas: {report['concurrent_window_s']:.2f}s)")
+
+    header = f"{'Ação':<14}{'n':>6}{'média':>10}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'máx':>10}"
+    print()
+    print(header)
+    print('-' * len(header))
+    rows = list(report['latency_by_action'].items()) + [('TOTAL', report['latency'])]
+    for action, s in rows:
+        print(f"{action:<14}{s['count']:>6}{s['mean_ms']:>10.0f}{s['p50_ms']:>10.0f}{s['p90_ms']:>10.0f}"
+              f"{s['p95_ms']:>10.0f}{s['p99_ms']:>10.0f}{s['max_ms']:>10.0f}")
+    print('(latências em ms, medidas no cliente)')
+
+    print()
+    m = report['server_memory']
+    if m is None:
+        print('💾 Memória do servidor indisponível: instale psutil (pip install psutil)')
+    else:
+        print(f"💾 Servidor (pid {m['pid']}): RSS antes {m['rss_before_mb']:.1f} MB | "
+              f"pico {m['peak_rss_mb']:.1f} MB | depois {m['rss_after_mb']:.1f} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Teste de carga do dashboard: sessões headless simultâneas contra um servidor streamlit run'
+    )
+    parser.add_argument('--sessions', type=int, default=5, help='Número de sessões simultâneas')
+    parser.add_argument('--interactions', type=int, default=10, help='Interações por sessão (além da carga inicial)')
+    parser.add_argument('--rows', type=int, default=1000, help='Linhas do dataset sintético')
+    parser.add_argument('--months', type=int, default=12, help='Meses cobertos pelo dataset sintético')
+    parser.add_argument('--seed', type=int, default=0, help='Semente dos dados e das interações')
+    parser.add_argument('--port', type=int, default=0, help='Porta do servidor de teste (0 = porta livre)')
+    parser.add_argument('--timeout', type=float, default=120, help='Tempo máximo por rerun, em segundos')
+    parser.add_argument('--json', metavar='ARQUIVO', help='Salva o relatório completo em JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.sessions < 1:
+        raise SystemExit('--sessions deve ser pelo menos 1')
+    report = run_load_test(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import random
+import statistics
+
+import pandas as pd
+import pytest
+
+from dashboard import load_data
+from loadtest import CSV_COLUMNS, concurrent_throughput, generate_synthetic_csv, percentile, summarize
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 100])
+def test_percentile_matches_statistics_inclusive(size):
+    rng = random.Random(size)
+    values = [rng.uniform(0, 10) for _ in range(size)]
+    expected = statistics.quantiles(values, n=100, method='inclusive') if size > 1 else [values[0]] * 99
+    for pct in (1, 25, 50, 90, 95, 99):
+        assert percentile(values, pct) == pytest.approx(expected[pct - 1])
+
+
+def test_percentile_bounds():
+    values = [3.0, 1.0, 2.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 3.0
+
+
+def test_empty_latencies():
+    assert percentile([], 95) == 0.0
+    assert summarize([]) == {
+        'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p90_ms': 0.0,
+        'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0,
+    }
+
+
+def test_summarize_in_milliseconds():
+    summary = summarize([0.1, 0.2, 0.3])
+    assert summary['count'] == 3
+    assert summary['mean_ms'] == pytest.approx(200)
+    assert summary['p50_ms'] == pytest.approx(200)
+    assert summary['max_ms'] == pytest.approx(300)
+
+
+def test_concurrent_throughput_counts_only_overlap():
+    sessions = [
+        {'started_at': 0.0, 'finished_at': 10.0, 'samples': [('a', 0.0, 1.0), ('a', 1.0, 5.0), ('a', 5.0, 10.0)]},
+        {'started_at': 2.0, 'finished_at': 6.0, 'samples': [('a', 2.0, 4.0), ('a', 4.0, 6.0)]},
+    ]
+    window, throughput = concurrent_throughput(sessions)
+    assert window == 4.0
+    # Reruns concluídos entre 2s e 6s: 5.0, 4.0 e 6.0
+    assert throughput == pytest.approx(3 / 4.0)
+
+
+def test_synthetic_csv_loads_through_dashboard(tmp_path, monkeypatch):
+    (tmp_path / 'glpi.csv').write_bytes(generate_synthetic_csv(250, seed=1))
+    monkeypatch.chdir(tmp_path)
+    load_data.clear()
+    try:
+        df = load_data()
+    finally:
+        load_data.clear()
+
+    assert df is not None
+    assert set(CSV_COLUMNS) <= set(df.columns)
+    # Todos os técnicos sintéticos são do time principal, então nenhuma linha é filtrada
+    assert len(df) == 250
+    assert pd.api.types.is_datetime64_any_dtype(df['Data de abertura'])
+    assert df['Data de abertura'].notna().all()
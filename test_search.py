@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from dashboard import build_search_index, search_tickets
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    build_search_index.clear()
+    yield
+    build_search_index.clear()
+
+
+@pytest.fixture
+def tickets():
+    # Índices não contíguos, como após o filtro do time em load_data
+    return pd.DataFrame(
+        {
+            'Título': ['Criar usuário no PC', 'Criar e-mail', 'Reset de senha', 'CRIAR USUARIO GPM'],
+            'Requerente - Requerente': ['Luana Martinha ', 'José Antônio ', 'Diego Felipe<br>Luana Martinha ', None],
+        },
+        index=[10, 20, 30, 40],
+    )
+
+
+def search(df, query):
+    return search_tickets(build_search_index(df, 'teste'), query)
+
+
+def test_accent_folding(tickets):
+    assert sorted(search(tickets, 'usuario')) == [10, 40]
+    assert sorted(search(tickets, 'USUÁRIO')) == [10, 40]
+    assert list(search(tickets, 'jose antonio')) == [20]
+
+
+def test_prefix_matching(tickets):
+    assert sorted(search(tickets, 'usu')) == [10, 40]
+    assert sorted(search(tickets, 'cri')) == [10, 20, 40]
+
+
+def test_all_terms_must_match(tickets):
+    assert list(search(tickets, 'criar pc')) == [10]
+    assert list(search(tickets, 'criar senha')) == []
+
+
+def test_requester_split_on_br(tickets):
+    assert sorted(search(tickets, 'luana')) == [10, 30]
+    assert sorted(search(tickets, 'felipe luana')) == [30]
+    assert list(search(tickets, 'br')) == []
+
+
+def test_query_without_tokens_returns_none(tickets):
+    assert search(tickets, '') is None
+    assert search(tickets, ' ?!-- ') is None
+
+
+def test_missing_column(tickets):
+    df = tickets.drop(columns=['Requerente - Requerente'])
+    assert list(search(df, 'luana')) == []
+    assert sorted(search(df, 'usuario')) == [10, 40]